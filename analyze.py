@@ -1,5 +1,9 @@
 import re
-from typing import List, Tuple, Dict, Any
+from array import array
+from bisect import bisect_right
+from typing import List, Tuple, Dict, Any, Sequence
+
+RULES_VERSION = 7
 
 RISK_KEYWORDS: List[Tuple[str, int, str]] = [
     ("tek taraflı fesih", 3, "Fesih iki tarafa eşitlensin ve bildirim süresi eklensin."),
@@ -16,13 +20,32 @@ RISK_KEYWORDS: List[Tuple[str, int, str]] = [
     ("telif", 2, "Kullanım lisansı kapsamı ve süresi sınırlı, ödeme ile koşullu yazılsın."),
 ]
 
-def _split_clauses(text: str) -> List[Tuple[str, str]]:
+TR_FOLD = str.maketrans("İIıŞşĞğÜüÖöÇçÂâÎîÛû", "iiissgguuooccaaiiuu")
+
+COMBINING_RE = re.compile("[\u0300-\u036f]")
+
+def fold_tr(text: str) -> str:
+    return COMBINING_RE.sub("", text.translate(TR_FOLD).lower())
+
+def fold_map(text: str) -> Tuple[str, Sequence[int]]:
+    folded = text.translate(TR_FOLD).lower()
+    if not COMBINING_RE.search(folded):
+        return folded, range(len(text) + 1)
+    offsets = array("l", (i for i, c in enumerate(folded) if not "\u0300" <= c <= "\u036f"))
+    offsets.append(len(text))
+    return COMBINING_RE.sub("", folded), offsets
+
+MADDE_RE = re.compile(r"\bmadde\s*(\d+)\b")
+
+def _split_clauses(text: str, folded: str = None) -> List[Tuple[str, str]]:
+    if folded is None:
+        folded = fold_tr(text)
     lines = text.splitlines()
     clauses: List[Tuple[str, str]] = []
     current_id = "Genel"
     current_buf: List[str] = []
-    for ln in lines:
-        m = re.search(r"(?i)\bmadde\s*(\d+)\b", ln)
+    for ln, fl in zip(lines, folded.splitlines()):
+        m = MADDE_RE.search(fl)
         if m:
             if current_buf:
                 clauses.append((current_id, "\n".join(current_buf).strip()))
@@ -41,103 +64,155 @@ def _split_clauses(text: str) -> List[Tuple[str, str]]:
             clauses.append((f"Bölüm {i}", p))
     return clauses
 
-def _snippet(s: str, match: re.Match, span: int = 180) -> str:
-    start = max(0, match.start() - span // 2)
-    end = min(len(s), match.end() + span // 2)
-    return s[start:end].replace("\n", " ").strip()
+def _snippet(s: str, start: int, end: int, span: int = 180) -> str:
+    lo = max(0, start - span // 2)
+    hi = min(len(s), end + span // 2)
+    return s[lo:hi].replace("\n", " ").strip()
 
-def _clause_spans(text: str) -> List[Dict[str, Any]]:
+def _clause_spans(folded: str) -> List[Dict[str, Any]]:
     spans: List[Dict[str, Any]] = []
-    idx = [(m.group(1), m.start()) for m in re.finditer(r"(?i)\bmadde\s*(\d+)\b", text)]
+    idx = [(m.group(1), m.start()) for m in MADDE_RE.finditer(folded)]
     for i, (num, start) in enumerate(idx):
-        end = idx[i+1][1] if i+1 < len(idx) else len(text)
+        end = idx[i+1][1] if i+1 < len(idx) else len(folded)
         spans.append({"id": f"Madde {num}", "start": start, "end": end})
     return spans
 
+def _clause_at(spans: List[Dict[str, Any]], pos: int) -> str:
+    for sp in spans:
+        if pos >= sp["start"] and pos < sp["end"]:
+            return sp["id"]
+    return ""
+
+UNIT_SUFFIX = r"(?:l(?:ik|uk|ar|er|a|e)[a-z]*|[dt](?:ir|ur|a|e|an|en)|s?[iuae](?:n(?:da|de|dan|den)?)?|n[iu]n)?(?![a-z])"
+
+FACT_RE = re.compile(
+    r"(?:%|yuzde)\s*(?P<pct>\d{1,3}(?:,\d+)?)"
+    r"|(?<![\d.,])(?P<num>\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:[.,]\d+)?)\s*"
+    r"(?:(?P<days>gun)|(?P<weeks>hafta)|(?P<months>ay)|(?P<years>yil)|(?P<tl>tl\b|₺|turk\s*lirasi\b))"
+    + UNIT_SUFFIX
+)
+
+THOUSANDS_RE = re.compile(r"\d{1,3}(?:\.\d{3})+(?:,\d+)?")
+
+DURATION_KINDS = ("days", "weeks", "months", "years")
+
+PAYMENT_WORDS = ("odem", "oden", "vade", "fatura", "ucret")
+
+SENTENCE_END_RE = re.compile(r"[.;\n](?!\d)")
+
+def _parse_number(s: str) -> float:
+    if THOUSANDS_RE.fullmatch(s):
+        s = s.replace(".", "")
+    v = float(s.replace(",", "."))
+    return int(v) if v.is_integer() else v
+
+def _sentence_starts(folded: str) -> List[int]:
+    return [0] + [m.end() for m in SENTENCE_END_RE.finditer(folded)]
+
+def _sentence_at(starts: List[int], pos: int) -> int:
+    return starts[bisect_right(starts, pos) - 1]
+
+def extract_facts(folded: str, spans: List[Dict[str, Any]] = None, sentences: List[int] = None) -> List[Dict[str, Any]]:
+    if spans is None:
+        spans = _clause_spans(folded)
+    if sentences is None:
+        sentences = _sentence_starts(folded)
+    ends = sentences[1:] + [len(folded)]
+    facts: List[Dict[str, Any]] = []
+    for m in FACT_RE.finditer(folded):
+        kind = m.lastgroup
+        raw = m.group("pct") if kind == "pct" else m.group("num")
+        if kind == "years" and len(raw) == 4 and raw.isdigit():
+            continue
+        i = bisect_right(sentences, m.start()) - 1
+        sentence = folded[sentences[i]:ends[i]]
+        topic = "odeme" if any(w in sentence for w in PAYMENT_WORDS) else ""
+        facts.append({"kind": kind, "value": _parse_number(raw), "start": m.start(), "end": m.end(), "clause": _clause_at(spans, m.start()), "sentence": sentences[i], "topic": topic})
+    return facts
+
+def _nearest_fact(facts: List[Dict[str, Any]], kind: str, sentence: int, pos: int) -> Dict[str, Any]:
+    cands = [f for f in facts if f["kind"] == kind and f["sentence"] == sentence]
+    after = [f for f in cands if f["start"] >= pos]
+    return min(after or cands, key=lambda f: abs(f["start"] - pos)) if cands else None
+
+def _line_prefix(text: str, pos: int) -> str:
+    return text[text.rfind("\n", 0, pos) + 1:pos]
+
 ADV_PATTERNS: List[Dict[str, Any]] = [
-    {"name": "Tek taraflı fesih", "pattern": r"(?i)tek tarafl[ıi].*fes(h|i)", "weight": 3, "suggest": "Fesih hakkını karşılıklı ve bildirim süreli yapalım."},
-    {"name": "Cezai şart", "pattern": r"(?i)cezai\s*şart", "weight": 3, "suggest": "Cezai şart kaldırılmalı veya toplam ücretin %10’u ile sınırlandırılmalı."},
-    {"name": "Süresiz gizlilik", "pattern": r"(?i)süresiz.*gizlilik|gizlilik.*süresiz", "weight": 2, "suggest": "Gizlilik süresi 6–12 ay ile sınırlandırılmalı."},
-    {"name": "Rekabet yasağı", "pattern": r"(?i)rekabet\s*yasa[ğg][ıi]", "weight": 2, "suggest": "En fazla 6 ay, konu ve coğrafya ile sınırlı olmalı."},
-    {"name": "Yetkili mahkeme", "pattern": r"(?i)yetkili\s*mahkeme|tahkim", "weight": 2, "suggest": "Yer seçimi dengeli olmalı; masraf paylaşımı netleşmeli."},
-    {"name": "Sınırsız sorumluluk", "pattern": r"(?i)sorumluluk.*(sınırsız|her t[üu]rl[üu])", "weight": 3, "suggest": "Toplam sözleşme bedeli ile sınırlandırılmalı."},
-    {"name": "Gecikme faizi", "pattern": r"(?i)gecikme\s*faizi", "weight": 2, "suggest": "Makul bir üst sınır ve gecikme gerekçesi tanımlanmalı."},
-    {"name": "Sebep göstermeden iptal", "pattern": r"(?i)sebep\s*g[öo]stermeden.*(iptal|fes(h|i))", "weight": 2, "suggest": "İptal durumda makul tazminat/ödenen kısmın iadesi düzenlenmeli."},
-    {"name": "Feragat", "pattern": r"(?i)peşin\s*feragat|feragat\s*edilir", "weight": 2, "suggest": "Genel feragat kaldırılmalı; hak arama özgürlüğü korunmalı."},
-    {"name": "Telif ve kullanım devri", "pattern": r"(?i)telif|kullan[ıi]m\s*hakk[ıi]", "weight": 2, "suggest": "Lisans kapsamı/süresi sınırlı ve ödeme ile koşullu olmalı."},
-    {"name": "Revizyon sınırı yok", "pattern": r"(?i)revizyon(?!.*\d+)|sınırsız\s*revizyon", "weight": 1, "suggest": "Revizyon sayısı ve kapsamı net yazılmalı."},
-    {"name": "Teslim ve kabul belirsiz", "pattern": r"(?i)teslim.*(kabul|onay).*muğlak|kabul.*tek tarafl[ıi]", "weight": 1, "suggest": "Ölçülebilir kabul kriterleri ve iki taraflı süreç yazılmalı."},
+    {"name": "Tek taraflı fesih", "pattern": r"tek tarafli.*fes(h|i)", "weight": 3, "suggest": "Fesih hakkını karşılıklı ve bildirim süreli yapalım."},
+    {"name": "Cezai şart", "pattern": r"cezai\s*sart", "weight": 3, "suggest": "Cezai şart kaldırılmalı veya toplam ücretin %10’u ile sınırlandırılmalı."},
+    {"name": "Süresiz gizlilik", "pattern": r"suresiz.*gizlilik|gizlilik.*suresiz", "weight": 2, "suggest": "Gizlilik süresi 6–12 ay ile sınırlandırılmalı."},
+    {"name": "Rekabet yasağı", "pattern": r"rekabet\s*yasagi", "weight": 2, "suggest": "En fazla 6 ay, konu ve coğrafya ile sınırlı olmalı."},
+    {"name": "Yetkili mahkeme", "pattern": r"yetkili\s*mahkeme|tahkim", "weight": 2, "suggest": "Yer seçimi dengeli olmalı; masraf paylaşımı netleşmeli."},
+    {"name": "Sınırsız sorumluluk", "pattern": r"sorumluluk.*(sinirsiz|her turlu)", "weight": 3, "suggest": "Toplam sözleşme bedeli ile sınırlandırılmalı."},
+    {"name": "Gecikme faizi", "pattern": r"gecikme\s*faizi", "weight": 2, "suggest": "Makul bir üst sınır ve gecikme gerekçesi tanımlanmalı."},
+    {"name": "Sebep göstermeden iptal", "pattern": r"sebep\s*gostermeden.*(iptal|fes(h|i))", "weight": 2, "suggest": "İptal durumda makul tazminat/ödenen kısmın iadesi düzenlenmeli."},
+    {"name": "Feragat", "pattern": r"pesin\s*feragat|feragat\s*edilir", "weight": 2, "suggest": "Genel feragat kaldırılmalı; hak arama özgürlüğü korunmalı."},
+    {"name": "Telif ve kullanım devri", "pattern": r"telif|kullanim\s*hakki", "weight": 2, "suggest": "Lisans kapsamı/süresi sınırlı ve ödeme ile koşullu olmalı."},
+    {"name": "Revizyon sınırı yok", "pattern": r"revizyon(?!.*\d+)|sinirsiz\s*revizyon", "weight": 1, "suggest": "Revizyon sayısı ve kapsamı net yazılmalı."},
+    {"name": "Teslim ve kabul belirsiz", "pattern": r"teslim.*(kabul|onay).*muglak|kabul.*tek tarafli", "weight": 1, "suggest": "Ölçülebilir kabul kriterleri ve iki taraflı süreç yazılmalı."},
 ]
 
-def _duration_present(text: str) -> bool:
-    return bool(re.search(r"(?i)(\d+)\s*(g[üu]n|hafta|ay|y[ıi]l)", text))
+def _duration_present(facts: List[Dict[str, Any]]) -> bool:
+    return any(f["kind"] in DURATION_KINDS for f in facts)
 
-def _payment_risk(text: str) -> List[Dict[str, Any]]:
+def _payment_risk(folded: str, facts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     items = []
-    for m in re.finditer(r"(?i)(\d{2,})\s*g[üu]n", text):
-        days = int(m.group(1))
-        if days > 45:
-            items.append({"name": "Uzun ödeme vadesi", "weight": 2 if days <= 60 else 3, "suggest": "Ödeme vadesi 15–30 gün aralığında olmalı.", "match": m})
-    if re.search(r"(?i)ödeme.*(kabul|onay).*tek tarafl[ıi]", text):
-        m = re.search(r"(?i)ödeme.*(kabul|onay).*tek tarafl[ıi]", text)
-        if m:
-            items.append({"name": "Ödeme tek taraflı kabule bağlı", "weight": 2, "suggest": "Ödeme objektif teslim koşullarına bağlanmalı ve iki taraflı olmalı.", "match": m})
+    for f in facts:
+        if f["kind"] == "days" and f["topic"] == "odeme" and f["value"] > 45:
+            days = int(f["value"])
+            items.append({"name": "Uzun ödeme vadesi", "weight": 2 if days <= 60 else 3, "suggest": "Ödeme vadesi 15–30 gün aralığında olmalı.", "start": f["start"], "end": f["end"], "days": days})
+    m = re.search(r"odeme.*(kabul|onay).*tek tarafli", folded)
+    if m:
+        items.append({"name": "Ödeme tek taraflı kabule bağlı", "weight": 2, "suggest": "Ödeme objektif teslim koşullarına bağlanmalı ve iki taraflı olmalı.", "start": m.start(), "end": m.end()})
     return items
 
-def _positives(text: str) -> List[str]:
+def _positives(folded: str, facts: List[Dict[str, Any]]) -> List[str]:
     pos = []
-    if re.search(r"(?i)fes(h|i)h\s*hakk[ıi].*(iki|karşılıklı)\s*taraf", text):
+    if re.search(r"fes(h|i)h\s*hakki.*(iki|karsilikli)\s*taraf", folded):
         pos.append("Fesih hakkı karşılıklı düzenlenmiş.")
-    if re.search(r"(?i)sorumluluk.*(üst\s*s[ıi]n[ıi]r|azami|limit).*?(bedel|tutar|miktar)", text):
+    if re.search(r"sorumluluk.*(ust\s*sinir|azami|limit).*?(bedel|tutar|miktar)", folded):
         pos.append("Sorumluluk üst sınırla sınırlandırılmış.")
-    if re.search(r"(?i)gizlilik.*(\d+)\s*(ay|y[ıi]l)", text):
+    if any(f["kind"] in ("months", "years") and "gizlilik" in _line_prefix(folded, f["start"]) for f in facts):
         pos.append("Gizlilik süresi belirli ve süreli.")
-    if re.search(r"(?i)revizyon.*?(en\s*fazla|en\s*çok|\d+)", text):
+    if re.search(r"revizyon.*?(en\s*fazla|en\s*cok|\d+)", folded):
         pos.append("Revizyonlar sayı veya kapsam olarak sınırlandırılmış.")
-    if re.search(r"(?i)ödeme.*(15|30)\s*g[üu]n", text):
+    if any(f["kind"] == "days" and f["value"] in (15, 30) and f["topic"] == "odeme" for f in facts):
         pos.append("Ödeme vadesi 15–30 gün aralığında.")
-    if re.search(r"(?i)kabul\s*kriterleri|ölçülebilir\s*kriter", text):
+    if re.search(r"kabul\s*kriterleri|olculebilir\s*kriter", folded):
         pos.append("Kabul kriterleri ölçülebilir şekilde yazılmış.")
-    if re.search(r"(?i)yetkili\s*mahkeme.*(taraflar|bulunduğu\s*yer)", text):
+    if re.search(r"yetkili\s*mahkeme.*(taraflar|bulundugu\s*yer)", folded):
         pos.append("Yetkili mahkeme seçimi dengeli.")
-    if re.search(r"(?i)taraf(lar|ı)", text):
+    if re.search(r"taraf(lar|i)", folded):
         pos.append("Taraflar açıkça belirtilmiş.")
-    if re.search(r"(?i)(sözleşmenin|işin)\s*konusu|hizmet", text):
+    if re.search(r"(sozlesmenin|isin)\s*konusu|hizmet", folded):
         pos.append("İşin/kapsamın tanımı mevcut.")
-    if re.search(r"(?i)(başlangıç|bitiş|süre|tarih).*?(\d+)", text):
+    if re.search(r"(baslangic|bitis|sure|tarih).*?(\d+)", folded):
         pos.append("Tarih veya süre bilgisi yazılmış.")
     return pos
 
 def advanced_analyze(text: str, detailed: bool = True, total_fee: float = None, monthly_fee: float = None, audience: str = "Avukat") -> Dict[str, Any]:
-    clauses = _split_clauses(text)
-    spans = _clause_spans(text)
+    folded, offsets = fold_map(text)
+    clauses = _split_clauses(text, folded)
+    spans = _clause_spans(folded)
+    sentences = _sentence_starts(folded)
+    facts = extract_facts(folded, spans, sentences)
     total_score = 10
     risk_items: List[Dict[str, Any]] = []
-    positives: List[str] = _positives(text)
-    lowered = text.lower()
+    positives: List[str] = _positives(folded, facts)
     for pat in ADV_PATTERNS:
-        for m in re.finditer(pat["pattern"], text):
+        for m in re.finditer(pat["pattern"], folded):
             total_score -= pat["weight"]
-            clause = ""
-            ms = m.start()
-            for sp in spans:
-                if ms >= sp["start"] and ms < sp["end"]:
-                    clause = sp["id"]
-                    break
-            risk_items.append({"name": pat["name"], "weight": pat["weight"], "suggest": pat["suggest"], "match": m, "snippet": _snippet(text, m), "clause": clause})
-    for pr in _payment_risk(text):
+            risk_items.append({"name": pat["name"], "weight": pat["weight"], "suggest": pat["suggest"], "start": m.start(), "snippet": _snippet(text, offsets[m.start()], offsets[m.end()]), "clause": _clause_at(spans, m.start()), "sentence": _sentence_at(sentences, m.start())})
+    for pr in _payment_risk(folded, facts):
         total_score -= pr["weight"]
-        clause = ""
-        ms = pr["match"].start() if pr.get("match") else -1
-        if ms >= 0:
-            for sp in spans:
-                if ms >= sp["start"] and ms < sp["end"]:
-                    clause = sp["id"]
-                    break
-        risk_items.append({"name": pr["name"], "weight": pr["weight"], "suggest": pr["suggest"], "match": pr.get("match"), "snippet": _snippet(text, pr["match"]) if pr.get("match") else "", "clause": clause})
-    if re.search(r"(?i)gizlilik", lowered) and not _duration_present(text):
+        risk_items.append({"name": pr["name"], "weight": pr["weight"], "suggest": pr["suggest"], "start": pr["start"], "snippet": _snippet(text, offsets[pr["start"]], offsets[pr["end"]]), "clause": _clause_at(spans, pr["start"]), "sentence": _sentence_at(sentences, pr["start"]), "days": pr.get("days")})
+    if "gizlilik" in folded and not _duration_present(facts):
         total_score -= 2
-        risk_items.append({"name": "Gizlilik süresi belirtilmemiş", "weight": 2, "suggest": "Gizlilik süresi 6–12 ay ile sınırlandırılmalı.", "match": None, "snippet": ""})
+        risk_items.append({"name": "Gizlilik süresi belirtilmemiş", "weight": 2, "suggest": "Gizlilik süresi 6–12 ay ile sınırlandırılmalı.", "start": -1, "snippet": ""})
+    for it in risk_items:
+        f_pct = _nearest_fact(facts, "pct", it["sentence"], it["start"]) if it["start"] >= 0 else None
+        it["pct"] = f_pct["value"] if f_pct else None
     total_score = max(1, min(10, total_score))
     color = "Yeşil" if total_score >= 8 else ("Sarı" if total_score >= 5 else "Kırmızı")
     out: List[str] = []
@@ -146,7 +221,8 @@ def advanced_analyze(text: str, detailed: bool = True, total_fee: float = None,
         out.append("### ⚠️ Önemli Riskler")
         if risk_items:
             for it in risk_items:
-                out.append(f"- {it['name']}: {it['suggest']}")
+                line = f"- {it['name']}: {it['suggest']}"
+                out.append(line)
         else:
             out.append("- Belirgin risk yok.")
         out.append("### ✅ İyi Taraflar")
@@ -154,13 +230,15 @@ def advanced_analyze(text: str, detailed: bool = True, total_fee: float = None,
             out.extend([f"- {p}" for p in positives])
         else:
             out.append("- Dengeli maddeler var.")
+        out.append("### 👉 Ne Yapmalıyım?")
     else:
         out.append(f"## 🛡️ Güven Puanı: {total_score}/10 ({color})")
         out.append("### 🚨 Kırmızı Bayraklar (Riskler)")
         if risk_items:
             for it in risk_items:
                 prefix = f"{it['clause']}: " if it.get("clause") else ""
-                out.append(f"- **{prefix}{it['name']}:** {it['snippet']} -> {it['suggest']}")
+                line = f"- **{prefix}{it['name']}:** {it['snippet']} -> {it['suggest']}"
+                out.append(line)
         else:
             out.append("- Belirgin bir kırmızı bayrak tespit edilmedi.")
         out.append("### ✅ Olumlu Yanlar")
@@ -175,9 +253,14 @@ def advanced_analyze(text: str, detailed: bool = True, total_fee: float = None,
     decision = "İmzalama, kapsamlı revizyon şart." if total_score <= 4 else ("Müzakere ederek revizyonlarla imzalanabilir." if total_score <= 7 else "Küçük revizyonlarla imzalanabilir.")
     main_risks = ", ".join([i["name"] for i in sorted(risk_items, key=lambda x: -x["weight"])[:3]]) or "Belirgin ağır risk yok"
     main_pos = ", ".join(positives[:3]) or "Belirgin olumlu denge yok"
-    out.append(f"Karar: {decision}") if audience == "Freelancer" else out.append(f"Risk matrisi: yüksek={high}, orta={mid}, düşük={low}. Karar: {decision}")
-    out.append(f"Ana riskler: {main_risks}.")
-    out.append(f"Olumlu noktalar: {main_pos}.")
+    if audience == "Freelancer":
+        out.append(f"Karar: {decision}")
+        out.append(f"Ana riskler: {main_risks}.")
+        out.append(f"Olumlu noktalar: {main_pos}.")
+    else:
+        out.append(f"Risk matrisi: yüksek={high}, orta={mid}, düşük={low}. Karar: {decision}")
+        out.append(f"Ana riskler: {main_risks}.")
+        out.append(f"Olumlu noktalar: {main_pos}.")
     top3 = []
     seen = set()
     for it in sorted(risk_items, key=lambda x: -x["weight"]):
@@ -187,16 +270,81 @@ def advanced_analyze(text: str, detailed: bool = True, total_fee: float = None,
             top3.append(s)
         if len(top3) == 3:
             break
-    out.append("### ✅ İmzalamadan Önce 3 Düzeltme" if audience == "Freelancer" else "### ✅ Öncelikli Revizyonlar (3 madde)")
+    if audience == "Freelancer":
+        out.append("### ✅ İmzalamadan Önce 3 Düzeltme")
+    else:
+        out.append("### ✅ Öncelikli Revizyonlar (3 madde)")
     if top3:
         out.extend([f"- {s}" for s in top3])
+    if audience == "Freelancer":
+        out.append("### 🧭 Müzakere Planı")
+    else:
+        out.append("### 🧭 Müzakere Planı")
+    unique_suggest = []
+    for i in risk_items:
+        if i["suggest"] not in unique_suggest:
+            unique_suggest.append(i["suggest"])
+    if unique_suggest:
+        out.extend([f"- {s}" for s in unique_suggest])
+    else:
+        out.append("- Belirgin müzakere talebi yok.")
+    ceza_pct = None
+    ceza_tl = None
+    for it in risk_items:
+        if it["name"] == "Cezai şart":
+            f_tl = _nearest_fact(facts, "tl", it["sentence"], it["start"])
+            if it["pct"] is not None and ceza_pct is None:
+                ceza_pct = it["pct"]
+            if f_tl and ceza_tl is None:
+                ceza_tl = f_tl["value"]
+    liab_unlimited = any(i["name"] == "Sınırsız sorumluluk" for i in risk_items)
+    long_pay = [i for i in risk_items if i["name"] == "Uzun ödeme vadesi"]
+    if ceza_pct or ceza_tl or liab_unlimited or long_pay:
+        out.append("### 💰 Finansal Etki Tahmini")
+        fee_str = "belirtilmedi"
+        if total_fee and total_fee > 0:
+            fee_str = f"{int(total_fee)} TL"
+        if any(i["name"] == "Cezai şart" for i in risk_items):
+            if total_fee and ceza_pct:
+                out.append(f"- Olası ceza: yaklaşık {int(total_fee * ceza_pct/100)} TL (%{ceza_pct} oranıyla).")
+            elif ceza_pct:
+                out.append(f"- Olası ceza: %{ceza_pct} (toplam ücret {fee_str}).")
+            elif ceza_tl:
+                out.append(f"- Olası ceza: {ceza_tl} TL (sözleşmede yazan tutar).")
+            else:
+                out.append(f"- Olası ceza: toplam ücretin ~%10’u (toplam ücret {fee_str}).")
+        if liab_unlimited:
+            out.append("- Sorumluluk: sınırsız maruziyet. Öneri: toplam sözleşme bedeli ile sınırlandırılsın.")
+        for lp in long_pay:
+            out.append(f"- Nakit akışı gecikmesi: {lp['days']} gün vade. Öneri: 15–30 gün.")
+    if audience == "Freelancer":
+        out.append("### ✍️ Karşı Tarafa Söyle")
+        for s in unique_suggest:
+            out.append(f"- {s}")
+        out.append("### 📚 İyi Pratikler")
+        out.append("- Cezai şart oranı ve üst sınırı yazılsın.")
+        out.append("- Gizlilik ve rekabet yasağı süreli ve sınırlı olsun.")
+        out.append("- Sorumluluk toplam bedelle sınırlandırılsın.")
+        out.append("- Ödeme vadesi 15–30 gün olsun.")
+        out.append("- Fesih karşılıklı ve bildirim süreli olsun.")
+    else:
+        out.append("### ✍️ Redline Cümleleri")
+        for s in unique_suggest:
+            out.append(f"- Önerilen ifade: {s}")
+        out.append("### 📚 İyi Pratikler")
+        out.append("- Cezai şart varsa oran ve üst sınır yazılsın.")
+        out.append("- Gizlilik ve rekabet yasağı süreli ve konu/saha ile sınırlı olsun.")
+        out.append("- Sorumluluk toplam bedel ile sınırlandırılsın; dolaylı zararlar hariç.")
+        out.append("- Ödeme vadeleri 15–30 gün; kabul kriterleri ölçülebilir olsun.")
+        out.append("- Fesih karşılıklı ve bildirim süreli düzenlensin.")
     return {
         "markdown": "\n".join(out),
         "score": total_score,
         "high": high,
         "mid": mid,
         "low": low,
-        "suggestions": list({i["suggest"] for i in risk_items}),
-        "risks": [{"name": r["name"], "snippet": r["snippet"], "suggest": r["suggest"], "weight": r["weight"], "clause": r.get("clause", "")} for r in risk_items],
+        "suggestions": unique_suggest,
+        "risks": [{"name": r["name"], "snippet": r["snippet"], "suggest": r["suggest"], "weight": r["weight"], "clause": r.get("clause", ""), "pct": r["pct"]} for r in risk_items],
+        "facts": [{"kind": f["kind"], "value": f["value"], "clause": f["clause"], "start": f["start"], "topic": f["topic"]} for f in facts],
         "audience": audience
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,275 @@
+import io
+import os
+import re
+import sys
+import time
+import sqlite3
+import hashlib
+import argparse
+from typing import List, Dict, Any, Optional
+from analyze import RULES_VERSION, advanced_analyze, extract_facts, fold_map, fold_tr, _split_clauses
+
+SCHEMA_VERSION = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    doc_id TEXT PRIMARY KEY,
+    title TEXT,
+    text_hash TEXT,
+    score INTEGER,
+    high INTEGER,
+    mid INTEGER,
+    low INTEGER,
+    indexed_at REAL
+);
+CREATE TABLE IF NOT EXISTS risks (
+    doc_id TEXT,
+    name TEXT,
+    name_key TEXT,
+    weight INTEGER,
+    clause TEXT,
+    snippet TEXT,
+    pct REAL
+);
+CREATE INDEX IF NOT EXISTS risks_name ON risks(name_key, doc_id);
+CREATE INDEX IF NOT EXISTS risks_doc ON risks(doc_id);
+CREATE TABLE IF NOT EXISTS facts (
+    doc_id TEXT,
+    kind TEXT,
+    value REAL,
+    clause TEXT,
+    pos INTEGER,
+    topic TEXT
+);
+CREATE INDEX IF NOT EXISTS facts_kind ON facts(kind, value);
+CREATE INDEX IF NOT EXISTS facts_doc ON facts(doc_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS clauses USING fts5(
+    doc_id UNINDEXED,
+    clause UNINDEXED,
+    raw UNINDEXED,
+    body,
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+def default_index_path() -> str:
+    base = os.getenv("APPDATA") or os.path.expanduser("~")
+    return os.path.join(base, "AnlasmaNet", "index.sqlite")
+
+def open_index(path: str = "") -> sqlite3.Connection:
+    p = path or default_index_path()
+    if p != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(p)), exist_ok=True)
+    conn = sqlite3.connect(p)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with conn:
+            for table in ("contracts", "risks", "facts", "clauses"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+def doc_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def risk_key(name: str) -> str:
+    return " ".join(fold_tr(name).split())
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(f"{RULES_VERSION}.{SCHEMA_VERSION}\0{text}".encode("utf-8")).hexdigest()
+
+def upsert_contract(conn: sqlite3.Connection, doc_id: str, text: str, title: str = "", res: Optional[Dict[str, Any]] = None) -> bool:
+    h = text_hash(text)
+    row = conn.execute("SELECT text_hash FROM contracts WHERE doc_id = ?", (doc_id,)).fetchone()
+    if row is not None and row["text_hash"] == h:
+        return False
+    if res is None:
+        res = advanced_analyze(text, detailed=True)
+    folded = fold_tr(text)
+    facts = res.get("facts")
+    if facts is None:
+        facts = extract_facts(folded)
+    with conn:
+        conn.execute("DELETE FROM risks WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM facts WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM clauses WHERE doc_id = ?", (doc_id,))
+        conn.execute(
+            "INSERT OR REPLACE INTO contracts (doc_id, title, text_hash, score, high, mid, low, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (doc_id, title or doc_id, h, res.get("score", 0), res.get("high", 0), res.get("mid", 0), res.get("low", 0), time.time()),
+        )
+        conn.executemany(
+            "INSERT INTO risks (doc_id, name, name_key, weight, clause, snippet, pct) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(doc_id, r["name"], risk_key(r["name"]), r["weight"], r.get("clause", ""), r.get("snippet", ""), r.get("pct")) for r in res.get("risks", [])],
+        )
+        conn.executemany(
+            "INSERT INTO facts (doc_id, kind, value, clause, pos, topic) VALUES (?, ?, ?, ?, ?, ?)",
+            [(doc_id, f["kind"], f["value"], f["clause"], f["start"], f["topic"]) for f in facts],
+        )
+        conn.executemany(
+            "INSERT INTO clauses (doc_id, clause, raw, body) VALUES (?, ?, ?, ?)",
+            [(doc_id, cid, body, fold_tr(body)) for cid, body in _split_clauses(text, folded)],
+        )
+    return True
+
+def index_contract(doc_id: str, text: str, title: str = "", res: Optional[Dict[str, Any]] = None, path: str = "") -> bool:
+    conn = open_index(path)
+    try:
+        return upsert_contract(conn, doc_id, text, title=title, res=res)
+    finally:
+        conn.close()
+
+def remove_contract(conn: sqlite3.Connection, doc_id: str) -> bool:
+    with conn:
+        for table in ("risks", "facts", "clauses"):
+            conn.execute(f"DELETE FROM {table} WHERE doc_id = ?", (doc_id,))
+        return conn.execute("DELETE FROM contracts WHERE doc_id = ?", (doc_id,)).rowcount > 0
+
+FTS_OPERATORS = ("AND", "OR", "NOT")
+
+def _fts_query(query: str) -> str:
+    terms: List[str] = []
+    for tok in query.split():
+        if tok in FTS_OPERATORS:
+            if terms and terms[-1] not in FTS_OPERATORS:
+                terms.append(tok)
+            continue
+        if re.search(r"\w", tok):
+            terms.append('"' + fold_tr(tok).replace('"', '""') + '"')
+    while terms and terms[-1] in FTS_OPERATORS:
+        terms.pop()
+    return " ".join(terms)
+
+def _restore_snippet(snip: str, raw: str) -> str:
+    folded, offsets = fold_map(raw)
+    plain = snip.replace("\x01", "").replace("\x02", "")
+    pre = "…" if plain.startswith("…") else ""
+    post = "…" if len(plain) > 1 and plain.endswith("…") else ""
+    core = plain[len(pre):len(plain) - len(post)]
+    at = folded.find(core)
+    if at < 0:
+        return snip.replace("\x01", "[").replace("\x02", "]")
+    out: List[str] = []
+    seen = 0
+    for ch in snip:
+        if ch == "\x01":
+            out.append("[")
+        elif ch == "\x02":
+            out.append("]")
+        else:
+            if len(pre) <= seen < len(pre) + len(core):
+                k = at + seen - len(pre)
+                out.append(raw[offsets[k]:offsets[k + 1]])
+            else:
+                out.append(ch)
+            seen += 1
+    return "".join(out)
+
+def search(conn: sqlite3.Connection, query: str = "", risk: str = "", pct_over: Optional[float] = None, payment_days_over: Optional[float] = None, max_score: Optional[int] = None, match_any: bool = False, limit: int = 50) -> List[Dict[str, Any]]:
+    conds: List[str] = []
+    params: List[Any] = []
+    query = _fts_query(query)
+    risk = risk_key(risk)
+    if risk and pct_over is not None:
+        conds.append("EXISTS (SELECT 1 FROM risks r WHERE r.doc_id = c.doc_id AND r.name_key = ? AND r.pct > ?)")
+        params += [risk, pct_over]
+    elif risk:
+        conds.append("EXISTS (SELECT 1 FROM risks r WHERE r.doc_id = c.doc_id AND r.name_key = ?)")
+        params.append(risk)
+    elif pct_over is not None:
+        conds.append("EXISTS (SELECT 1 FROM facts f WHERE f.doc_id = c.doc_id AND f.kind = 'pct' AND f.value > ?)")
+        params.append(pct_over)
+    if payment_days_over is not None:
+        conds.append("EXISTS (SELECT 1 FROM facts f WHERE f.doc_id = c.doc_id AND f.kind = 'days' AND f.topic = 'odeme' AND f.value > ?)")
+        params.append(payment_days_over)
+    if max_score is not None:
+        conds.append("c.score <= ?")
+        params.append(max_score)
+    if query:
+        conds.append("c.doc_id IN (SELECT doc_id FROM clauses WHERE clauses MATCH ?)")
+        params.append(query)
+    sql = "SELECT c.doc_id, c.title, c.score, c.high, c.mid, c.low FROM contracts c"
+    if conds:
+        sql += " WHERE " + (" OR " if match_any else " AND ").join(f"({x})" for x in conds)
+    sql += " ORDER BY c.score ASC, c.doc_id LIMIT ?"
+    params.append(limit)
+    rows = [dict(r) for r in conn.execute(sql, params)]
+    if query:
+        for r in rows:
+            hit = conn.execute(
+                "SELECT clause, raw, snippet(clauses, 3, char(1), char(2), '…', 12) AS snip FROM clauses WHERE clauses MATCH ? AND doc_id = ? LIMIT 1",
+                (query, r["doc_id"]),
+            ).fetchone()
+            r["clause"] = hit["clause"] if hit else ""
+            r["snippet"] = _restore_snippet(hit["snip"], hit["raw"]) if hit else ""
+    return rows
+
+def extract_pdf_text(data: bytes) -> str:
+    import pdfplumber
+    parts: List[str] = []
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages:
+            t = page.extract_text() or ""
+            if t.strip():
+                parts.append(t)
+    return "\n\n".join(parts).strip()
+
+def _read_document(path: str) -> str:
+    if path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            return extract_pdf_text(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="contract_index", description="AnlaşmaNet sözleşme dizini")
+    ap.add_argument("--db", default="", help="Dizin dosyası (varsayılan: yapılandırma klasörü)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    add = sub.add_parser("add", help="PDF veya metin dosyalarını dizine ekle/güncelle")
+    add.add_argument("paths", nargs="+")
+    rm = sub.add_parser("remove", help="Belgeleri dizinden çıkar (dosya yolu veya belge kimliği)")
+    rm.add_argument("ids", nargs="+")
+    q = sub.add_parser("search", help="Dizinde ara")
+    q.add_argument("query", nargs="?", default="")
+    q.add_argument("--risk", default="")
+    q.add_argument("--pct-over", type=float, default=None)
+    q.add_argument("--payment-days-over", type=float, default=None, help="Ödeme cümlesinde geçen gün sayısı bu değerden büyük")
+    q.add_argument("--max-score", type=int, default=None)
+    q.add_argument("--any", action="store_true", help="Koşullardan herhangi biri yeterli")
+    q.add_argument("--limit", type=int, default=50)
+    args = ap.parse_args(argv)
+    conn = open_index(args.db)
+    if args.cmd == "add":
+        for p in args.paths:
+            try:
+                text = _read_document(p)
+                changed = upsert_contract(conn, doc_key(text), text, title=os.path.basename(p))
+                print(f"{'güncellendi' if changed else 'değişmedi'}: {p} ({doc_key(text)})")
+            except Exception as e:
+                print(f"hata: {p}: {e}", file=sys.stderr)
+        return 0
+    if args.cmd == "remove":
+        missing = 0
+        for p in args.ids:
+            if remove_contract(conn, doc_key(_read_document(p)) if os.path.isfile(p) else p):
+                print(f"silindi: {p}")
+            else:
+                missing += 1
+                print(f"bulunamadı: {p}", file=sys.stderr)
+        return 1 if missing else 0
+    try:
+        rows = search(conn, args.query, risk=args.risk, pct_over=args.pct_over, payment_days_over=args.payment_days_over, max_score=args.max_score, match_any=args.any, limit=args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"hata: arama yapılamadı: {e}", file=sys.stderr)
+        return 1
+    for r in rows:
+        line = f"{r['score']}/10  {r['title']}  ({r['doc_id']})"
+        if r.get("snippet"):
+            line += f"  [{r['clause'] or 'Genel'}] {r['snippet']}"
+        print(line)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
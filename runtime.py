@@ -0,0 +1,157 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Tuple, Union
+
+LLM_MAX_CONCURRENCY = max(1, int(os.getenv("ANLASMANET_LLM_CONCURRENCY", "4") or 4))
+WORKER_COUNT = max(1, int(os.getenv("ANLASMANET_WORKERS", "0") or 0) or (os.cpu_count() or 1))
+
+_inflight_lock = threading.Lock()
+_inflight: Dict[str, Future] = {}
+_llm_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+
+def work_key(kind: str, data: Union[bytes, str], **settings: Any) -> str:
+    h = hashlib.sha256()
+    h.update(kind.encode("utf-8") + b"\0")
+    h.update(data if isinstance(data, bytes) else data.encode("utf-8"))
+    for k in sorted(settings):
+        h.update(f"\0{k}={settings[k]}".encode("utf-8"))
+    return h.hexdigest()
+
+class _LeaderAborted(Exception):
+    pass
+
+def _release(key: str, fut: Future) -> None:
+    with _inflight_lock:
+        if _inflight.get(key) is fut:
+            del _inflight[key]
+
+def single_flight(key: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    while True:
+        with _inflight_lock:
+            fut = _inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                _inflight[key] = fut
+        if leader:
+            break
+        try:
+            return fut.result()
+        except _LeaderAborted:
+            continue
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        _release(key, fut)
+        fut.set_exception(e)
+        raise
+    except BaseException:
+        _release(key, fut)
+        fut.set_exception(_LeaderAborted())
+        raise
+    _release(key, fut)
+    fut.set_result(result)
+    return result
+
+@contextmanager
+def llm_slot() -> Iterator[None]:
+    with _llm_slots:
+        yield
+
+_config_lock = threading.Lock()
+_config_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+def load_config(path: str) -> Dict[str, Any]:
+    try:
+        info = os.stat(path)
+    except OSError:
+        return {}
+    stamp = (info.st_mtime_ns, info.st_size)
+    with _config_lock:
+        hit = _config_cache.get(path)
+        if hit is not None and hit[0] == stamp:
+            return dict(hit[1])
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        data = {}
+    with _config_lock:
+        _config_cache[path] = (stamp, data)
+    return dict(data)
+
+_http_lock = threading.Lock()
+_http_session = None
+
+def http_session() -> Any:
+    global _http_session
+    with _http_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            sess = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(LLM_MAX_CONCURRENCY, WORKER_COUNT))
+            sess.mount("https://", adapter)
+            sess.mount("http://", adapter)
+            _http_session = sess
+        return _http_session
+
+_procs_lock = threading.Lock()
+_procs = None
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _procs
+    with _procs_lock:
+        if _procs is None:
+            _procs = ProcessPoolExecutor(max_workers=WORKER_COUNT)
+        return _procs
+
+def _drop_process_pool(pool: ProcessPoolExecutor) -> None:
+    global _procs
+    with _procs_lock:
+        if _procs is pool:
+            _procs = None
+
+_fair_cv = threading.Condition()
+_fair_queues: "OrderedDict[str, Deque[Tuple[Future, Callable[..., Any], tuple, dict]]]" = OrderedDict()
+_workers: List[threading.Thread] = []
+
+def _worker() -> None:
+    while True:
+        with _fair_cv:
+            while not _fair_queues:
+                _fair_cv.wait()
+            session_id, queue = _fair_queues.popitem(last=False)
+            fut, fn, args, kwargs = queue.popleft()
+            if queue:
+                _fair_queues[session_id] = queue
+        if not fut.set_running_or_notify_cancel():
+            continue
+        pool = _process_pool()
+        try:
+            fut.set_result(pool.submit(fn, *args, **kwargs).result())
+        except BrokenProcessPool as e:
+            _drop_process_pool(pool)
+            fut.set_exception(e)
+        except BaseException as e:
+            fut.set_exception(e)
+
+def submit_pooled(session_id: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    fut: Future = Future()
+    with _fair_cv:
+        while len(_workers) < WORKER_COUNT:
+            t = threading.Thread(target=_worker, name=f"anlasmanet-{len(_workers)}", daemon=True)
+            t.start()
+            _workers.append(t)
+        _fair_queues.setdefault(session_id, deque()).append((fut, fn, args, kwargs))
+        _fair_cv.notify()
+    return fut
+
+def run_pooled(session_id: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    return submit_pooled(session_id, fn, *args, **kwargs).result()
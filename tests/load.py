@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from runtime import WORKER_COUNT, load_config, run_pooled, submit_pooled, work_key, single_flight
+from analyze import advanced_analyze
+from contract_index import doc_key, extract_pdf_text, index_contract, open_index
+
+SESSIONS = 50
+ROUNDS = 2
+LINES = 10
+SERVICE_BOUND = 2.0
+QUEUE_BOUND = 2.5
+
+def _pdf(lines):
+    body = "BT /F1 10 Tf 14 TL 40 800 Td " + " ".join(f"({ln}) '" for ln in lines) + " ET"
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [4 0 R] /Count 1 >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents 5 0 R >>",
+        f"<< /Length {len(body)} >>\nstream\n{body}\nendstream",
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, o in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{o}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return out
+
+def _contract(tag):
+    lines = [f"Madde {k} Odeme vadesi {k * 15} gundur. Cezai sart %{k * 5} uygulanir. {tag}" for k in range(1, LINES + 1)]
+    return _pdf(lines), tag
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def _request(sid, doc, cfg, db):
+    data, tag = doc
+    t0 = time.perf_counter()
+    load_config(cfg)
+    text, extract = single_flight(work_key("pdf", data), run_pooled, sid, _timed, extract_pdf_text, data)
+    if tag not in text:
+        raise AssertionError(f"{sid}: {tag} metinde yok")
+    res, analyze = run_pooled(sid, _timed, advanced_analyze, text)
+    if not any(r["name"] == "Cezai şart" and r["pct"] == 5 for r in res["risks"]):
+        raise AssertionError(f"{sid}: {tag} cezai şart oranı bulunamadı")
+    changed, index = run_pooled(sid, _timed, index_contract, doc_key(text), text, tag, res, db)
+    if not changed:
+        raise AssertionError(f"{sid}: {tag} dizine yazılmadı")
+    return time.perf_counter() - t0, extract + analyze + index
+
+def _run(label, sessions, rounds, cfg, db):
+    docs = {f"s{i}": [_contract(f"{label}-s{i}-r{r}") for r in range(rounds)] for i in range(sessions)}
+    totals, services, errors = [], [], []
+    lock = threading.Lock()
+    start = threading.Barrier(sessions)
+    def body(sid):
+        start.wait()
+        try:
+            for doc in docs[sid]:
+                total, service = _request(sid, doc, cfg, db)
+                with lock:
+                    totals.append(total)
+                    services.append(service)
+        except BaseException as e:
+            errors.append(e)
+    ts = [threading.Thread(target=body, args=(sid,)) for sid in docs]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    if errors:
+        raise errors[0]
+    return {
+        "sessions": sessions,
+        "requests": len(totals),
+        "p50_ms": round(_pct(totals, 0.5) * 1000, 3),
+        "p95_ms": round(_pct(totals, 0.95) * 1000, 3),
+        "service_p50_ms": round(_pct(services, 0.5) * 1000, 3),
+        "service_p95_ms": round(_pct(services, 0.95) * 1000, 3),
+    }
+
+def _fairness():
+    order = []
+    def done(name):
+        return lambda fut: order.append(name)
+    batch = [submit_pooled("batch", _timed, extract_pdf_text, _contract(f"toplu-{i}")[0]) for i in range(8 * WORKER_COUNT)]
+    for f in batch:
+        f.add_done_callback(done("batch"))
+    user = submit_pooled("user", _timed, extract_pdf_text, _contract("kullanici")[0])
+    user.add_done_callback(done("user"))
+    user.result()
+    for f in batch:
+        f.result()
+    return {"batch_queued": len(batch), "user_position": order.index("user")}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="AnlaşmaNet yük testi")
+    ap.add_argument("--strict", action="store_true", help="Gecikme sınırları aşılırsa hata kodu döndür")
+    args = ap.parse_args(argv)
+    with tempfile.TemporaryDirectory() as d:
+        cfg = os.path.join(d, "config.json")
+        with open(cfg, "w", encoding="utf-8") as f:
+            json.dump({"MODEL": "gemini-1.5-flash", "AUDIENCE": "Avukat"}, f)
+        db = os.path.join(d, "index.sqlite")
+        open_index(db).close()
+        _run("isinma", 1, WORKER_COUNT, cfg, db)
+        base = _run("tekil", 1, 10, cfg, db)
+        loaded = _run("yuk", SESSIONS, ROUNDS, cfg, db)
+        fair = _fairness()
+        conn = open_index(db)
+        indexed = conn.execute("SELECT COUNT(*) FROM contracts").fetchone()[0]
+        conn.close()
+    if indexed != WORKER_COUNT + 10 + SESSIONS * ROUNDS:
+        raise AssertionError(f"dizinde {indexed} belge var")
+    rounds_ahead = math.ceil(SESSIONS / WORKER_COUNT)
+    queue_limit = QUEUE_BOUND * rounds_ahead * base["service_p95_ms"]
+    checks = {
+        "batch_does_not_starve_user": fair["user_position"] < fair["batch_queued"] // 2,
+    }
+    advisory = {
+        "service_p50": loaded["service_p50_ms"] <= SERVICE_BOUND * base["service_p50_ms"],
+        "service_p95": loaded["service_p95_ms"] <= SERVICE_BOUND * base["service_p95_ms"],
+        "fair_share_p50": loaded["p50_ms"] <= queue_limit,
+        "fair_share_p95": loaded["p95_ms"] <= queue_limit,
+    }
+    if args.strict:
+        checks.update(advisory)
+    ok = all(checks.values())
+    print(json.dumps({"status": "ok" if ok else "fail", "workers": WORKER_COUNT, "baseline": base, "load": loaded, "fairness": fair, "indexed": indexed, "queue_limit_ms": round(queue_limit, 3), "checks": checks, "advisory": advisory}))
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
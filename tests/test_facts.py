@@ -0,0 +1,82 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyze import advanced_analyze, extract_facts, fold_tr, _nearest_fact, _sentence_at, _sentence_starts
+
+TEXT = (
+    "Madde 1 Taraflar 2024 yılında 5 ayrı hizmet için anlaşmıştır. Sözleşme 1.5 ay sürer.\n"
+    "Madde 2 Ödeme vadesi 60 gündür. Fatura bedeli 12.500,50 TL'dir. Gecikmede %3 uygulanır.\n"
+    "Madde 3 Cezai şart olarak toplam ücretin %20'si ödenir. Teslim 3 hafta içinde yapılır.\n"
+    "Madde 4 Gizlilik yükümlülüğü 2 yıl sürer; bildirim 10 gün önceden yapılır.\n"
+)
+
+def _facts():
+    folded = fold_tr(TEXT)
+    return folded, extract_facts(folded)
+
+def test_extract_facts():
+    folded, facts = _facts()
+    got = [(f["kind"], f["value"], f["clause"]) for f in facts]
+    assert got == [
+        ("months", 1.5, "Madde 1"),
+        ("days", 60, "Madde 2"),
+        ("tl", 12500.5, "Madde 2"),
+        ("pct", 3, "Madde 2"),
+        ("pct", 20, "Madde 3"),
+        ("weeks", 3, "Madde 3"),
+        ("years", 2, "Madde 4"),
+        ("days", 10, "Madde 4"),
+    ], got
+    spans = [folded[f["start"]:f["end"]] for f in facts]
+    assert spans == ["1.5 ay", "60 gundur", "12.500,50 tl", "%3", "%20", "3 hafta", "2 yil", "10 gun"], spans
+
+def test_payment_topic():
+    folded, facts = _facts()
+    paid = [(f["kind"], f["value"]) for f in facts if f["topic"] == "odeme"]
+    assert paid == [("days", 60), ("tl", 12500.5), ("pct", 20)], paid
+    notice = "Madde 2 Fesih bildirimi 90 gün önceden yapılır."
+    res = advanced_analyze(notice)
+    assert not any(r["name"] == "Uzun ödeme vadesi" for r in res["risks"]), res["risks"]
+    assert [(f["kind"], f["value"], f["topic"]) for f in res["facts"]] == [("days", 90, "")]
+    res = advanced_analyze("Madde 2 Fatura bedeli teslimden sonra 90 gün içinde ödenir.")
+    assert [(r["name"], r["weight"]) for r in res["risks"]] == [("Uzun ödeme vadesi", 3)], res["risks"]
+
+def test_nearest_fact_in_sentence():
+    folded, facts = _facts()
+    res = advanced_analyze(TEXT)
+    risk = next(r for r in res["risks"] if r["name"] == "Cezai şart")
+    assert risk["clause"] == "Madde 3" and risk["pct"] == 20, risk
+    pos = folded.find("cezai sart")
+    sentence = _sentence_at(_sentence_starts(folded), pos)
+    f = _nearest_fact(facts, "pct", sentence, pos)
+    assert f is not None and f["value"] == 20 and f["clause"] == "Madde 3", f
+    assert _nearest_fact(facts, "tl", sentence, pos) is None
+
+def test_nearest_fact_prefers_after_keyword():
+    text = "Madde 4 Gecikme faizi %5 olup ayrıca cezai şart olarak toplam bedelin %30'u ödenir."
+    folded = fold_tr(text)
+    facts = extract_facts(folded)
+    pos = folded.find("cezai sart")
+    assert _nearest_fact(facts, "pct", _sentence_at(_sentence_starts(folded), pos), pos)["value"] == 30
+    risk = next(r for r in advanced_analyze(text)["risks"] if r["name"] == "Cezai şart")
+    assert risk["pct"] == 30, risk
+    text = "Madde 4 Cezai şart uygulanır. Gecikme faizi %5'tir."
+    risk = next(r for r in advanced_analyze(text)["risks"] if r["name"] == "Cezai şart")
+    assert risk["pct"] is None, risk
+
+def main():
+    failed = []
+    for name, fn in sorted(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            try:
+                fn()
+            except AssertionError as e:
+                failed.append(f"{name}: {e}")
+    print(json.dumps({"status": "fail" if failed else "ok", "failed": failed}, ensure_ascii=False))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyze import advanced_analyze, fold_map, fold_tr
+from contract_index import open_index, upsert_contract, search
+
+TEXT = "Madde 3 Cezai şart olarak toplam ücretin %20'si ödenir. Sorumluluk her türlü zarar için sınırsızdır."
+
+def _nfd(s):
+    return unicodedata.normalize("NFD", s)
+
+def test_fold_tr():
+    src = "İSTANBUL Işık ığdır ÇAĞ Âşık Öğün Ürün Îmâ Ûslû"
+    assert fold_tr(src) == "istanbul isik igdir cag asik ogun urun ima uslu", fold_tr(src)
+    assert len(fold_tr(src)) == len(src)
+    folded, offsets = fold_map(src)
+    assert folded == fold_tr(src) and list(offsets) == list(range(len(src) + 1))
+
+def test_fold_map_decomposed():
+    src = _nfd("Cezai şart İŞ")
+    assert len(src) == 16
+    folded, offsets = fold_map(src)
+    assert folded == fold_tr(src) == "cezai sart is", folded
+    assert len(offsets) == len(folded) + 1 and offsets[-1] == len(src)
+    at = folded.find("sart")
+    assert src[offsets[at]:offsets[at + 4]] == _nfd("şart")
+    at = folded.find("is")
+    assert src[offsets[at]:offsets[at + 2]] == _nfd("İŞ")
+
+def test_analyze_decomposed():
+    want = advanced_analyze(TEXT)
+    got = advanced_analyze(_nfd(TEXT))
+    names = lambda res: [r["name"] for r in res["risks"]]
+    assert names(got) == names(want) and "Cezai şart" in names(got), names(got)
+    assert got["score"] == want["score"]
+    cezai = next(r for r in got["risks"] if r["name"] == "Cezai şart")
+    assert _nfd("Cezai şart") in cezai["snippet"] and cezai["clause"] == "Madde 3", cezai
+
+def test_search_decomposed():
+    conn = open_index(":memory:")
+    upsert_contract(conn, "nfd", _nfd(TEXT), title="nfd.pdf")
+    rows = search(conn, "cezai şart")
+    assert [r["doc_id"] for r in rows] == ["nfd"]
+    assert _nfd("[Cezai] [şart]") in rows[0]["snippet"], rows
+
+def main():
+    failed = []
+    for name, fn in sorted(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            try:
+                fn()
+            except AssertionError as e:
+                failed.append(f"{name}: {e}")
+    print(json.dumps({"status": "fail" if failed else "ok", "failed": failed}, ensure_ascii=False))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
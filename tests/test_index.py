@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contract_index import doc_key, main as index_main, open_index, upsert_contract, remove_contract, search
+
+TEXT = (
+    "Madde 1 Taraflar arasında hizmet sağlanacaktır.\n"
+    "Madde 2 Ödeme vadesi 60 gündür. Fatura bedeli 12.500,50 TL'dir. Gecikmede %3 uygulanır.\n"
+    "Madde 3 Cezai şart olarak toplam ücretin %20'si ödenir.\n"
+)
+
+def test_upsert_skip_update():
+    conn = open_index(":memory:")
+    assert upsert_contract(conn, "a", TEXT, title="a.txt")
+    assert not upsert_contract(conn, "a", TEXT, title="a.txt")
+    assert upsert_contract(conn, "a", TEXT.replace("%20", "%5"), title="a.txt")
+    assert conn.execute("SELECT COUNT(*) FROM contracts").fetchone()[0] == 1
+    assert conn.execute("SELECT MAX(value) FROM facts WHERE doc_id = 'a' AND clause = 'Madde 3' AND kind = 'pct'").fetchone()[0] == 5
+    assert remove_contract(conn, "a")
+    assert not remove_contract(conn, "a")
+    assert conn.execute("SELECT COUNT(*) FROM clauses").fetchone()[0] == 0
+
+def test_search_risk_pct_join():
+    conn = open_index(":memory:")
+    upsert_contract(conn, "high", TEXT, title="high.txt")
+    upsert_contract(conn, "low", TEXT.replace("%20", "%5"), title="low.txt")
+    upsert_contract(conn, "other", TEXT.replace("%20", "%5").replace("%3", "%30"), title="other.txt")
+    ids = lambda rows: [r["doc_id"] for r in rows]
+    assert ids(search(conn, risk="Cezai şart", pct_over=10)) == ["high"]
+    assert ids(search(conn, risk="Cezai şart", pct_over=25)) == []
+    assert sorted(ids(search(conn, pct_over=10))) == ["high", "other"]
+    assert sorted(ids(search(conn, risk="Cezai şart"))) == ["high", "low", "other"]
+    assert sorted(ids(search(conn, payment_days_over=45))) == ["high", "low", "other"]
+    assert ids(search(conn, payment_days_over=60)) == []
+    rows = search(conn, "CEZAİ ŞART", risk="Cezai şart", pct_over=10)
+    assert ids(rows) == ["high"] and rows[0]["clause"] == "Madde 3" and "[Cezai] [şart]" in rows[0]["snippet"], rows
+    assert search(conn, 'AND "unterminated (') == []
+
+def test_payment_days_follow_analyzer():
+    conn = open_index(":memory:")
+    upsert_contract(conn, "notice", "Madde 2 Fesih bildirimi 90 gün önceden yapılır.")
+    upsert_contract(conn, "pay", "Madde 2 Fatura bedeli teslimden sonra 90 gün içinde ödenir.")
+    assert [r["doc_id"] for r in search(conn, payment_days_over=45)] == ["pay"]
+    assert [r["doc_id"] for r in search(conn, risk="Uzun ödeme vadesi")] == ["pay"]
+
+def test_search_risk_pct_same_sentence():
+    conn = open_index(":memory:")
+    upsert_contract(conn, "late", "Madde 4 Gecikme faizi %5 olup ayrıca cezai şart olarak toplam bedelin %30'u ödenir.")
+    upsert_contract(conn, "rate", "Madde 4 Cezai şart uygulanır. Gecikme faizi %25'tir.")
+    assert [r["doc_id"] for r in search(conn, risk="Cezai şart", pct_over=20)] == ["late"]
+    assert [r["doc_id"] for r in search(conn, risk="Cezai şart", pct_over=30)] == []
+
+def test_cli_and_app_share_doc_key():
+    with tempfile.TemporaryDirectory() as d:
+        db = os.path.join(d, "index.sqlite")
+        path = os.path.join(d, "sozlesme.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(TEXT + "\n")
+        assert index_main(["--db", db, "add", path]) == 0
+        conn = open_index(db)
+        assert not upsert_contract(conn, doc_key(TEXT.strip()), TEXT.strip(), title="yuklenen.pdf")
+        rows = [dict(r) for r in conn.execute("SELECT doc_id, title FROM contracts")]
+        assert rows == [{"doc_id": doc_key(TEXT.strip()), "title": "sozlesme.txt"}], rows
+        conn.close()
+        assert index_main(["--db", db, "remove", path]) == 0
+        assert index_main(["--db", db, "remove", path]) == 1
+
+def test_risk_name_folded():
+    conn = open_index(":memory:")
+    upsert_contract(conn, "a", TEXT)
+    for name in ("Cezai şart", "cezai şart", "CEZAİ ŞART", "cezai sart", " cezai  sart "):
+        assert [r["doc_id"] for r in search(conn, risk=name)] == ["a"], name
+        assert [r["doc_id"] for r in search(conn, risk=name, pct_over=10)] == ["a"], name
+    assert search(conn, risk="cezai") == []
+
+def main():
+    failed = []
+    for name, fn in sorted(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            try:
+                fn()
+            except AssertionError as e:
+                failed.append(f"{name}: {e}")
+    print(json.dumps({"status": "fail" if failed else "ok", "failed": failed}, ensure_ascii=False))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import os
+import sys
+import json
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from runtime import single_flight, work_key
+
+WAITERS = 8
+
+class _Stop(BaseException):
+    pass
+
+def _callers(key, fn, n=WAITERS):
+    results = [None] * n
+    errors = [None] * n
+    ready = threading.Barrier(n)
+    def call(i):
+        ready.wait()
+        try:
+            results[i] = single_flight(key, fn, i)
+        except BaseException as e:
+            errors[i] = e
+    ts = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+    for t in ts:
+        t.start()
+    return ts, results, errors
+
+def _join(ts):
+    for t in ts:
+        t.join(10)
+    assert not any(t.is_alive() for t in ts), "single_flight callers hung"
+
+def test_coalesces_concurrent_calls():
+    calls = []
+    gate = threading.Event()
+    started = threading.Event()
+    def fn(i):
+        calls.append(i)
+        started.set()
+        gate.wait(10)
+        return f"sonuc-{i}"
+    ts, results, errors = _callers(work_key("test", "coalesce"), fn)
+    started.wait(10)
+    time.sleep(0.2)
+    gate.set()
+    _join(ts)
+    assert len(calls) == 1, calls
+    assert errors == [None] * WAITERS, errors
+    assert results == [f"sonuc-{calls[0]}"] * WAITERS, results
+
+def test_waiters_get_leader_exception():
+    calls = []
+    gate = threading.Event()
+    started = threading.Event()
+    def fn(i):
+        calls.append(i)
+        started.set()
+        gate.wait(10)
+        raise ValueError(f"bozuk-{i}")
+    ts, results, errors = _callers(work_key("test", "error"), fn)
+    started.wait(10)
+    time.sleep(0.2)
+    gate.set()
+    _join(ts)
+    assert len(calls) == 1, calls
+    assert all(isinstance(e, ValueError) and str(e) == f"bozuk-{calls[0]}" for e in errors), errors
+
+def test_waiters_retry_after_leader_base_exception():
+    calls = []
+    gate = threading.Event()
+    started = threading.Event()
+    def fn(i):
+        calls.append(i)
+        started.set()
+        gate.wait(10)
+        if len(calls) == 1:
+            raise _Stop()
+        time.sleep(0.2)
+        return f"sonuc-{i}"
+    key = work_key("test", "abort")
+    ts, results, errors = _callers(key, fn)
+    started.wait(10)
+    time.sleep(0.2)
+    gate.set()
+    _join(ts)
+    leader = calls[0]
+    assert isinstance(errors[leader], _Stop), errors
+    assert len(calls) == 2, calls
+    others = [i for i in range(WAITERS) if i != leader]
+    assert all(errors[i] is None for i in others), errors
+    assert all(results[i] == f"sonuc-{calls[1]}" for i in others), results
+    assert single_flight(key, lambda: "yeni") == "yeni"
+
+def main():
+    failed = []
+    for name, fn in sorted(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            try:
+                fn()
+            except AssertionError as e:
+                failed.append(f"{name}: {e}")
+    print(json.dumps({"status": "fail" if failed else "ok", "failed": failed}, ensure_ascii=False))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())